@@ -27,6 +27,8 @@ Uso por defecto:
 Uso avanzado:
     python compare_json.py <new.json> <old.json> [diferencias.json] [anomalies.json] [ready.json]
 
+Las salidas se escriben compactas; con `--pretty` se indentan a 2 espacios.
+
 El algoritmo ignora mayúsculas, tildes, espacios duplicados, NBSP y normaliza
 precios para comparación exhaustiva.
 """
@@ -34,50 +36,18 @@ precios para comparación exhaustiva.
 from __future__ import annotations
 
 import json
-import re
+import mmap
 import sys
-import unicodedata
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-
-# ---------------------------------------------------------------------------
-# Utilidades de normalización
-# ---------------------------------------------------------------------------
-
-def _strip_accents(text: str) -> str:
-    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
-
-
-def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text.replace("\u00A0", " ")).strip()
+from typing import Any, Dict, List
 
+try:  # orjson es opcional: parsea/serializa bastante más rápido que json
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-def normalize_text(text: str) -> str:
-    return _strip_accents(normalize_whitespace(text).lower())
-
-
-def normalize_price(price: str) -> str:
-    s = normalize_whitespace(price.lower()).replace("ars", "")
-    s = re.sub(r"[^0-9.,]", "", s)
-    if s.count(",") == 1 and s.count(".") == 0:
-        s = s.replace(",", ".")
-    if s.count(".") > 1:
-        dec = s.split(".")[-1]
-        ent = "".join(s.split(".")[:-1])
-        s = f"{ent}.{dec}"
-    elif s.count(",") > 1:
-        dec = s.split(",")[-1]
-        ent = "".join(s.split(",")[:-1])
-        s = f"{ent}.{dec}"
-    return s
-
-
-def normalize_item(item: Dict[str, Any]) -> Tuple[str, Tuple[str, ...], str]:
-    title = normalize_text(item.get("title", ""))
-    details = tuple(sorted(normalize_text(d) for d in item.get("details", [])))
-    price = normalize_price(item.get("price", ""))
-    return title, details, price
+from normalization import normalize_item, normalize_text
 
 # ---------------------------------------------------------------------------
 # Filtro de "AGOTADO"
@@ -87,7 +57,13 @@ def is_sold_out(item: Dict[str, Any]) -> bool:
     details = item.get("details", [])
     if len(details) != 1:
         return False
-    text = normalize_text(details[0]).replace("*", "").strip()
+    text = details[0]
+    if len(text) < len("agotado"):
+        return False
+    # ASCII: no hay tildes que quitar ni NBSP, alcanza con lower/strip
+    if text.isascii():
+        return text.lower().replace("*", "").strip() == "agotado"
+    text = normalize_text(text).replace("*", "").strip()
     return text == "agotado"
 
 
@@ -95,28 +71,54 @@ def filter_sold_out(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [it for it in items if not is_sold_out(it)]
 
 # ---------------------------------------------------------------------------
-# Carga
+# Carga y escritura
 # ---------------------------------------------------------------------------
 
 def load_json(path: Path) -> List[Dict[str, Any]]:
     if not path.is_file():
         sys.exit(f"Error: no se encontró el archivo {path}")
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        if orjson is not None and path.stat().st_size > 0:
+            # mmap evita copiar el archivo entero a un bytes antes de parsear
+            with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
+        else:
+            data = json.loads(path.read_bytes())
         if not isinstance(data, list):
             raise ValueError("El JSON de entrada debe ser un array de objetos.")
         return filter_sold_out(data)
     except json.JSONDecodeError as e:
         sys.exit(f"Error de parseo JSON en {path}: {e}")
 
+
+def dump_json(path: Path, data: Any, pretty: bool = False) -> None:
+    # Las salidas las consume el pipeline: compactas salvo que se pida --pretty
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        path.write_bytes(orjson.dumps(data, option=option))
+    elif pretty:
+        # json.dump escribe por fragmentos: no arma el string completo en memoria
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    else:
+        # Compacto con json.dumps: sólo la llamada única usa el encoder en C
+        # (json.dump siempre cae al iterencode en Python), a costa de tener
+        # la salida completa en memoria.
+        path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
 # ---------------------------------------------------------------------------
 # Comparación principal
 # ---------------------------------------------------------------------------
 
 def compare(new_items: List[Dict[str, Any]], old_items: List[Dict[str, Any]]) -> Dict[str, Any]:
-    to_insert, to_remove, unchanged, anomalies = [], [], [], []
+    to_insert: List[Dict[str, Any]] = []
+    unchanged: List[Dict[str, Any]] = []
+    anomalies: List[Dict[str, Any]] = []
 
-    def detect_duplicates(items: List[Dict[str, Any]], label: str):
+    def index_by_title(items: List[Dict[str, Any]], label: str) -> Dict[str, Dict[str, Any]]:
+        # Una sola pasada: agrupa por título normalizado, reporta duplicados
+        # y devuelve el mapa título -> ítem (gana la última aparición).
         grouped: defaultdict[str, List[Dict[str, Any]]] = defaultdict(list)
         for it in items:
             grouped[normalize_text(it.get("title", ""))].append(it)
@@ -125,31 +127,29 @@ def compare(new_items: List[Dict[str, Any]], old_items: List[Dict[str, Any]]) ->
                 anomalies.append({
                     "item": lst,
                     "source": label,
-                    "reason": f"{label} contiene {len(lst)} entradas duplicadas para el título '{title}'"
+                    "reason": f"{label} contiene {len(lst)} entradas duplicadas para el título '{title}'",
+                    "_norm_title": title,
                 })
+        return {title: lst[-1] for title, lst in grouped.items()}
 
-    detect_duplicates(new_items, "nuevo.json")
-    detect_duplicates(old_items, "viejo.json")
-
-    new_map = {normalize_text(i["title"]): i for i in new_items}
-    old_map = {normalize_text(i["title"]): i for i in old_items}
+    new_map = index_by_title(new_items, "nuevo.json")
+    old_map = index_by_title(old_items, "viejo.json")
 
     for key, new_it in new_map.items():
-        if key not in old_map:
+        old_it = old_map.get(key)
+        if old_it is None:
             to_insert.append(new_it)
+        elif normalize_item(new_it, key) == normalize_item(old_it, key):
+            unchanged.append(new_it)
         else:
-            if normalize_item(new_it) == normalize_item(old_map[key]):
-                unchanged.append(new_it)
-            else:
-                anomalies.append({
-                    "item": {"new": new_it, "old": old_map[key]},
-                    "source": "both",
-                    "reason": "Mismo título pero 'details' y/o 'price' difieren"
-                })
+            anomalies.append({
+                "item": {"new": new_it, "old": old_it},
+                "source": "both",
+                "reason": "Mismo título pero 'details' y/o 'price' difieren",
+                "_norm_title": key,
+            })
 
-    for key, old_it in old_map.items():
-        if key not in new_map:
-            to_remove.append(old_it)
+    to_remove = [it for key, it in old_map.items() if key not in new_map]
 
     return {
         "to_insert": to_insert,
@@ -162,23 +162,30 @@ def compare(new_items: List[Dict[str, Any]], old_items: List[Dict[str, Any]]) ->
 # Anomalías planas (solo new) y unión final
 # ---------------------------------------------------------------------------
 
+def _anomaly_title(entry: Dict[str, Any], item: Dict[str, Any]) -> str:
+    # compare() deja el título normalizado en "_norm_title"; sólo se recalcula
+    # para anomalías que no vengan de compare().
+    key = entry.get("_norm_title")
+    return key if key is not None else normalize_text(item.get("title", ""))
+
+
+def strip_aux_keys(anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: v for k, v in entry.items() if not k.startswith("_")} for entry in anomalies]
+
+
 def flatten_new_anomalies(anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    flat: List[Dict[str, Any]] = []
+    # Un solo recorrido: el dict deduplica por título y conserva el orden de
+    # inserción (gana la primera aparición).
+    uniq: Dict[str, Dict[str, Any]] = {}
     for entry in anomalies:
         item = entry.get("item")
         if isinstance(item, list):
             if entry.get("source") == "nuevo.json":
-                flat.extend(item)
+                for it in item:
+                    uniq.setdefault(_anomaly_title(entry, it), it)
         elif isinstance(item, dict) and "new" in item:
-            flat.append(item["new"])
-    seen = set()
-    uniq = []
-    for it in flat:
-        k = normalize_text(it.get("title", ""))
-        if k not in seen:
-            uniq.append(it)
-            seen.add(k)
-    return uniq
+            uniq.setdefault(_anomaly_title(entry, item["new"]), item["new"])
+    return list(uniq.values())
 
 
 def build_ready_list(to_insert: List[Dict[str, Any]], anomalies_new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -196,7 +203,8 @@ def build_ready_list(to_insert: List[Dict[str, Any]], anomalies_new: List[Dict[s
 # ---------------------------------------------------------------------------
 
 def main():
-    args = sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != "--pretty"]
+    pretty = "--pretty" in sys.argv[1:]
     new_path = Path(args[0]) if len(args) >= 1 else Path("nuevo.json")
     old_path = Path(args[1]) if len(args) >= 2 else Path("viejo.json")
     diff_path = Path(args[2]) if len(args) >= 3 else Path("diferencias.json")
@@ -210,10 +218,10 @@ def main():
     anomalies_only_new = flatten_new_anomalies(result["anomalies"])
     ready_items = build_ready_list(result["to_insert"], anomalies_only_new)
 
-    # Salidas
-    diff_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
-    anomalies_path.write_text(json.dumps(anomalies_only_new, ensure_ascii=False, indent=2), encoding="utf-8")
-    ready_path.write_text(json.dumps(ready_items, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Salidas (sin claves auxiliares como "_norm_title")
+    dump_json(diff_path, {**result, "anomalies": strip_aux_keys(result["anomalies"])}, pretty)
+    dump_json(anomalies_path, anomalies_only_new, pretty)
+    dump_json(ready_path, ready_items, pretty)
 
     # Resumen
     print("Resultados escritos en:")
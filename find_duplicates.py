@@ -1,5 +1,19 @@
 import json
 
+def _canonical(value):
+    """
+    Normalizes numbers so that values equal under == (true, 1 and 1.0) serialize identically.
+    """
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
 def find_duplicate_objects(file_path):
     """
     Iterates through a JSON file containing a list of objects and returns a list of duplicate objects.
@@ -16,30 +30,21 @@ def find_duplicate_objects(file_path):
     if not isinstance(data, list):
         return "Error: JSON content must be a list of objects."
 
-    seen_objects = []
+    seen = set()
+    dup_keys = set()
     duplicates = []
 
-    for i, obj1 in enumerate(data):
-        is_duplicate_found = False
-        # Check if this object (obj1) is a duplicate of any object already processed
-        for seen_obj in seen_objects:
-            if obj1 == seen_obj:
-                # Check if this specific duplicate instance is already in the duplicates list
-                # This avoids adding the same object multiple times if it appears more than twice
-                is_already_in_duplicates = False
-                for dup in duplicates:
-                    if obj1 == dup:
-                        is_already_in_duplicates = True
-                        break
-                if not is_already_in_duplicates:
-                    duplicates.append(obj1)
-                is_duplicate_found = True
-                break # Found a match in seen_objects, no need to check further for obj1
-        
-        if not is_duplicate_found:
-            # If obj1 is not a duplicate of already seen objects, add it to seen_objects
-            seen_objects.append(obj1)
-        
+    for obj in data:
+        # Canonical serialization: equal objects produce the same key regardless of key order
+        key = json.dumps(_canonical(obj), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        if key in seen:
+            # Record each duplicated object only once, even if it appears more than twice
+            if key not in dup_keys:
+                duplicates.append(obj)
+                dup_keys.add(key)
+        else:
+            seen.add(key)
+
     return duplicates
 
 if __name__ == "__main__":
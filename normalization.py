@@ -0,0 +1,71 @@
+"""normalization.py
+
+Utilidades de normalización compartidas por los scripts de comparación:
+títulos (mayúsculas, tildes, espacios duplicados, NBSP), precios y la tupla
+de comparación de cada ítem. Las funciones puras sobre ``str`` están
+memoizadas, así que la caché vale para todo el pipeline.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, Tuple
+
+_WS_RE = re.compile(r"\s+")
+_PRICE_RE = re.compile(r"[^0-9.,]")
+_REMOVE_SEPS = str.maketrans("", "", ".,")
+
+
+def _nfkd_strip(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+# Latin-1 Supplement y Latin Extended-A (á, é, ñ, ü, ...) -> equivalente ASCII
+_ACCENT_TABLE = {
+    cp: base
+    for cp in range(0x00C0, 0x0180)
+    if (base := _nfkd_strip(chr(cp))) != chr(cp) and base.isascii()
+}
+
+
+def _strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    text = text.translate(_ACCENT_TABLE)
+    if text.isascii():
+        return text
+    return _nfkd_strip(text)
+
+
+def normalize_whitespace(text: str) -> str:
+    return _WS_RE.sub(" ", text.replace("\u00A0", " ")).strip()
+
+
+@functools.cache
+def normalize_text(text: str) -> str:
+    return _strip_accents(normalize_whitespace(text).lower())
+
+
+@functools.cache
+def normalize_price(price: str) -> str:
+    # Un solo barrido: minúsculas, espacios y el prefijo "ARS" no dejan rastro
+    # tras filtrar a dígitos y separadores, así que se filtra directamente.
+    s = _PRICE_RE.sub("", price)
+    # El último separador es el decimal; los anteriores son de miles
+    last_sep = max(s.rfind("."), s.rfind(","))
+    if last_sep >= 0:
+        integer = s[:last_sep].translate(_REMOVE_SEPS)
+        fraction = s[last_sep + 1:]
+        s = f"{integer}.{fraction}"
+    return s
+
+
+def normalize_item(item: Dict[str, Any], title: str | None = None) -> Tuple[str, FrozenSet[str], str]:
+    if title is None:
+        title = normalize_text(item.get("title", ""))
+    # Los details se comparan sin orden y sin repeticiones: frozenset evita el sort
+    details = frozenset(normalize_text(d) for d in item.get("details", []))
+    price = normalize_price(item.get("price", ""))
+    return title, details, price